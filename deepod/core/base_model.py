@@ -4,8 +4,9 @@ Base class for deep Anomaly detection models
 some functions are adapted from the pyod library
 @Author: Hongzuo Xu <hongzuoxu@126.com, xuhongzuo13@nudt.edu.cn>
 """
-import sys
+import os
 import warnings
+from contextlib import contextmanager, nullcontext
 
 import numpy as np
 import torch
@@ -13,11 +14,10 @@ import random
 import time
 from abc import ABCMeta, abstractmethod
 from tqdm import tqdm
-from scipy.stats import binom
+from scipy.special import betainc
 from ray import tune
 from ray.air import session, Checkpoint
 from ray.tune.schedulers import ASHAScheduler
-from functools import partial
 from deepod.utils.utility import get_sub_seqs, get_sub_seqs_label
 
 
@@ -75,6 +75,28 @@ class BaseDeepAD(metaclass=ABCMeta):
     random_state： int, optional (default=42)
         the seed used by the random
 
+    deterministic: bool, optional (default=False)
+        If True, disable cuDNN autotuning and TF32 math on cuda devices
+        so that repeated runs with the same ``random_state`` are reproducible,
+        otherwise both are enabled during training unless
+        ``torch.backends.cudnn.deterministic`` is set. The flags of
+        ``torch.backends`` are restored after training.
+
+    use_amp: bool, optional (default=False)
+        If True, run forward passes under automatic mixed precision on cuda devices
+
+    amp_dtype: str, optional (default='float16')
+        Reduced precision used by mixed precision, choice = ['float16', 'bfloat16']
+
+    use_compile: bool, optional (default=False)
+        If True, wrap the network with ``torch.compile`` (requires torch>=2.0)
+        in training and inference, the forward pass of the network must be graph-safe
+
+    num_workers: int, optional (default=None)
+        Number of worker processes of the training data loaders, kept alive across
+        epochs, if None, min(4, number of CPUs) is used, 0 loads data in the main process.
+        Models not loading training batches with a ``DataLoader`` (e.g., REPEN, RoSAS, PReNet) ignore it
+
     Attributes
     ----------
     decision_scores_ : numpy array of shape (n_samples,)
@@ -93,13 +115,21 @@ class BaseDeepAD(metaclass=ABCMeta):
         and 1 for outliers/anomalies. It is generated by applying
         ``threshold_`` on ``decision_scores_``.
 
+    Notes
+    -----
+    ``deterministic``, ``use_amp``, ``amp_dtype``, ``use_compile`` and
+    ``num_workers`` are not arguments of the concrete models, set the attribute
+    of a model (e.g., ``model.deterministic = True``) before calling ``fit``.
+
     """
     def __init__(self, model_name, data_type='tabular', network='MLP',
                  epochs=100, batch_size=64, lr=1e-3,
                  n_ensemble=1, seq_len=100, stride=1,
                  epoch_steps=-1, prt_steps=10,
                  device='cuda', contamination=0.1,
-                 verbose=1, random_state=42):
+                 verbose=1, random_state=42, deterministic=False,
+                 use_amp=False, amp_dtype='float16', use_compile=False,
+                 num_workers=None):
         self.model_name = model_name
 
         self.data_type = data_type
@@ -119,6 +149,25 @@ class BaseDeepAD(metaclass=ABCMeta):
         self.device = device
         self.contamination = contamination
 
+        # batches of loaders built with ``pin_memory=self.pin_memory`` are copied
+        # to the device asynchronously, see ``training_prepare``
+        self.pin_memory = str(device).startswith('cuda')
+        self.non_blocking = self.pin_memory
+
+        # worker processes of the training loaders, see ``training_prepare``
+        self.num_workers = min(4, os.cpu_count() or 1) if num_workers is None else num_workers
+
+        if amp_dtype not in ('float16', 'bfloat16'):
+            raise ValueError(f"amp_dtype should be 'float16' or 'bfloat16', got {amp_dtype!r}")
+        self.use_amp = use_amp
+        self.amp_dtype = amp_dtype
+        self.scaler = None
+
+        self.use_compile = use_compile
+        # compiled wrappers of ``self._compiled_net`` per mode, see ``_compile_net``
+        self._compiled = {}
+        self._compiled_net = None
+
         self.epoch_steps = epoch_steps
         self.prt_steps = prt_steps
         self.verbose = verbose
@@ -143,10 +192,12 @@ class BaseDeepAD(metaclass=ABCMeta):
         self.decision_scores_ = None
         self.labels_ = None
         self.threshold_ = None
+        self._sorted_scores = None
 
         self.checkpoint_data = {}
 
         self.random_state = random_state
+        self.deterministic = deterministic
         self.set_seed(random_state)
         return
 
@@ -170,7 +221,8 @@ class BaseDeepAD(metaclass=ABCMeta):
         """
 
         if self.data_type == 'ts':
-            X_seqs = get_sub_seqs(X, seq_len=self.seq_len, stride=self.stride)
+            # zero-copy view of the sub-sequences, windows are only materialized batch by batch
+            X_seqs = get_sub_seqs(X, seq_len=self.seq_len, stride=self.stride, contiguous=False)
             y_seqs = get_sub_seqs_label(y, seq_len=self.seq_len, stride=self.stride) if y is not None else None
             self.train_data = X_seqs
             self.train_label = y_seqs
@@ -232,8 +284,10 @@ class BaseDeepAD(metaclass=ABCMeta):
         config : dict
             tuned hyper-parameter
         """
+        # compiled wrappers are not shipped to the trials of ray
+        self._compiled, self._compiled_net = {}, None
         if self.data_type == 'ts':
-            self.train_data = get_sub_seqs(X, self.seq_len, self.stride)
+            self.train_data = get_sub_seqs(X, self.seq_len, self.stride, contiguous=False)
             self.train_label = get_sub_seqs_label(y, self.seq_len, self.stride) if y is not None else None
             self.n_samples, self.n_features = self.train_data.shape[0], self.train_data.shape[2]
 
@@ -256,22 +310,23 @@ class BaseDeepAD(metaclass=ABCMeta):
             reduction_factor=2,
         )
 
-        size = sys.getsizeof(self.train_data)/(1024**2)
-        if size >= 30:
-            split = int(len(self.train_data) / (size / 30))
-            self.train_data = self.train_data[:split]
-            self.train_label = self.train_label[:split] if y is not None else None
-            warnings.warn('split training data to meet the 95 MiB limit of ray ImplitFunc')
-
-        result = tune.run(
-            partial(self._training_ray,
-                    X_test=X_test, y_test=y_test),
-            resources_per_trial={"cpu": 4, "gpu": 0 if self.device == 'cpu' else 1},
-            config=config,
-            num_samples=n_ray_samples,
-            time_budget_s=time_budget_s,
-            scheduler=scheduler,
-        )
+        # the raw training data are put into the object store by ``tune.with_parameters``
+        # and windowed in each trial, instead of being pickled with ``self`` into every
+        # trial function, the overlapping sub-sequences are never serialized
+        train_data, train_label = self.train_data, self.train_label
+        self.train_data, self.train_label = None, None
+        try:
+            result = tune.run(
+                tune.with_parameters(self._training_ray_on_data, X=X, y=y,
+                                     X_test=X_test, y_test=y_test),
+                resources_per_trial={"cpu": 4, "gpu": 0 if self.device == 'cpu' else 1},
+                config=config,
+                num_samples=n_ray_samples,
+                time_budget_s=time_budget_s,
+                scheduler=scheduler,
+            )
+        finally:
+            self.train_data, self.train_label = train_data, train_label
 
         best_trial = result.get_best_trial(metric=metric, mode=mode, scope="last")
         print(f"Best trial config: {best_trial.config}")
@@ -315,26 +370,32 @@ class BaseDeepAD(metaclass=ABCMeta):
         testing_n_samples = X.shape[0]
 
         if self.data_type == 'ts':
-            X = get_sub_seqs(X, seq_len=self.seq_len, stride=1)
+            X = get_sub_seqs(X, seq_len=self.seq_len, stride=1, contiguous=False)
 
-        representations = []
+        # representations of all ensemble members are written into one preallocated
+        # array of shape (n_ensemble, n_samples, ...), only when they are requested
+        representations = None
         s_final = np.zeros(testing_n_samples)
-        for _ in range(self.n_ensemble):
+        for e in range(self.n_ensemble):
             self.test_loader = self.inference_prepare(X)
 
             z, scores = self._inference()
             z, scores = self.decision_function_update(z, scores)
 
+            # the first seq_len-1 time points are not covered by any sub-sequence and keep a zero score
             if self.data_type == 'ts':
-                padding = np.zeros(self.seq_len-1)
-                scores = np.hstack((padding, scores))
+                s_final[self.seq_len-1:] += scores
+            else:
+                s_final += scores
 
-            s_final += scores
-            representations.extend(z)
-        representations = np.array(representations)
+            if return_rep:
+                if representations is None:
+                    representations = np.empty((self.n_ensemble,) + z.shape, dtype=z.dtype)
+                representations[e] = z
 
         if return_rep:
-            return s_final, representations
+            # stacked over ensemble members as before, reshaping the contiguous array is a view
+            return s_final, representations.reshape((-1,) + representations.shape[2:])
         else:
             return s_final
 
@@ -388,18 +449,21 @@ class BaseDeepAD(metaclass=ABCMeta):
         """
         n = len(self.decision_scores_)
 
-        count_instances = np.vectorize(lambda x: np.count_nonzero(self.decision_scores_ <= x))
-        n_instances = count_instances(test_scores)
+        # number of training scores that are smaller than or equal to each test score
+        n_instances = np.searchsorted(self._sorted_scores, test_scores, side='right')
 
         # Derive the outlier probability using Bayesian approach
-        posterior_prob = np.vectorize(lambda x: (1 + x) / (2 + n))(n_instances)
+        posterior_prob = (1. + n_instances) / (2. + n)
 
-        # Transform the outlier probability into a confidence value
-        confidence = np.vectorize(
-            lambda p: 1 - binom.cdf(n - int(n*self.contamination), n, p)
-        )(posterior_prob)
+        # Transform the outlier probability into a confidence value, i.e., binom.sf(k, n, p),
+        # written as the regularized incomplete beta function I_p(k+1, n-k)
+        k = n - int(n * self.contamination)
+        if k < n:
+            confidence = betainc(k + 1, n - k, posterior_prob)
+        else:
+            confidence = np.zeros(posterior_prob.shape)
         prediction = (test_scores > self.threshold_).astype('int').ravel()
-        np.place(confidence, prediction==0, 1-confidence[prediction == 0])
+        confidence = np.where(prediction == 0, 1. - confidence, confidence)
         return confidence
 
     def _process_decision_scores(self):
@@ -413,7 +477,16 @@ class BaseDeepAD(metaclass=ABCMeta):
         self
         """
 
-        self.threshold_ = np.percentile(self.decision_scores_, 100 * (1 - self.contamination))
+        self._sorted_scores = np.sort(self.decision_scores_)
+
+        # equivalent to np.percentile(decision_scores_, 100 * (1 - contamination)),
+        # linearly interpolated on the already sorted scores without sorting again
+        n = self._sorted_scores.size
+        h = (n - 1) * (1 - self.contamination)
+        lo = int(np.floor(h))
+        hi = min(lo + 1, n - 1)
+        self.threshold_ = self._sorted_scores[lo] + \
+            (h - lo) * (self._sorted_scores[hi] - self._sorted_scores[lo])
         self.labels_ = (self.decision_scores_ > self.threshold_).astype('int').ravel()
 
         self._mu = np.mean(self.decision_scores_)
@@ -424,45 +497,93 @@ class BaseDeepAD(metaclass=ABCMeta):
     def _training(self):
         optimizer = torch.optim.Adam(self.net.parameters(), lr=self.lr, eps=1e-6)
 
+        # loss scaling is only needed for float16, bfloat16 has the same exponent range as float32,
+        # the scaler is created once and kept across the ensemble members and calls of fit
+        use_scaler = self._amp_enabled() and self.amp_dtype == 'float16'
+        if use_scaler and self.scaler is None:
+            if hasattr(torch.amp, 'GradScaler'):
+                self.scaler = torch.amp.GradScaler('cuda')
+            else:
+                self.scaler = torch.cuda.amp.GradScaler()
+
+        # epoch time is measured on the device stream so that queued kernels are included
+        use_cuda_timer = str(self.device).startswith('cuda')
+        if use_cuda_timer:
+            # events are recorded on the stream of self.device, which is not always the current device
+            timer_stream = torch.cuda.current_stream(self.device)
+            start_evt = torch.cuda.Event(enable_timing=True)
+            end_evt = torch.cuda.Event(enable_timing=True)
+
+        net = self._compile_net(mode='reduce-overhead')
+
         self.net.train()
-        for i in range(self.epochs):
-            t1 = time.time()
-            total_loss = 0
-            cnt = 0
-            for batch_x in self.train_loader:
-                loss = self.training_forward(batch_x, self.net, self.criterion)
-                self.net.zero_grad()
-                loss.backward()
-                optimizer.step()
-
-                total_loss += loss.item()
-                cnt += 1
-
-                # terminate this epoch when reaching assigned maximum steps per epoch
-                if cnt > self.epoch_steps != -1:
-                    break
-
-            t = time.time() - t1
-            if self.verbose >= 1 and (i == 0 or (i+1) % self.prt_steps == 0):
-                print(f'epoch{i+1:3d}, '
-                      f'training loss: {total_loss/cnt:.6f}, '
-                      f'time: {t:.1f}s')
-
-            if i == 0:
-                self.epoch_time = t
-
-            self.epoch_update()
+        with self._cuda_backend_flags():
+            for i in range(self.epochs):
+                if use_cuda_timer:
+                    start_evt.record(timer_stream)
+                else:
+                    t1 = time.perf_counter()
+                # accumulated on the device, read back only when it is printed
+                total_loss = torch.zeros((), device=self.device)
+                cnt = 0
+                for batch_x in self.train_loader:
+                    batch_x = self._batch_to_device(batch_x)
+                    with self._autocast():
+                        loss = self.training_forward(batch_x, net, self.criterion)
+                    optimizer.zero_grad(set_to_none=True)
+                    if use_scaler:
+                        self.scaler.scale(loss).backward()
+                        self.scaler.step(optimizer)
+                        self.scaler.update()
+                    else:
+                        loss.backward()
+                        optimizer.step()
+
+                    total_loss += loss.detach()
+                    cnt += 1
+
+                    # terminate this epoch when reaching assigned maximum steps per epoch
+                    if cnt > self.epoch_steps != -1:
+                        break
+
+                if use_cuda_timer:
+                    end_evt.record(timer_stream)
+                    end_evt.synchronize()
+                    t = start_evt.elapsed_time(end_evt) / 1000.
+                else:
+                    t = time.perf_counter() - t1
+                if self.verbose >= 1 and (i == 0 or (i+1) % self.prt_steps == 0):
+                    print(f'epoch{i+1:3d}, '
+                          f'training loss: {total_loss.item()/cnt:.6f}, '
+                          f'time: {t:.1f}s')
+
+                if i == 0:
+                    self.epoch_time = t
+
+                self.epoch_update()
 
         return
 
     def _training_ray(self, config, X_test, y_test):
         return
 
+    def _training_ray_on_data(self, config, X, y, X_test, y_test):
+        """trial function of ray, windows the raw training data fetched by ``tune.with_parameters``"""
+        if self.data_type == 'ts':
+            self.train_data = get_sub_seqs(X, self.seq_len, self.stride, contiguous=False)
+            self.train_label = get_sub_seqs_label(y, self.seq_len, self.stride) if y is not None else None
+        else:
+            self.train_data = X
+            self.train_label = y
+        return self._training_ray(config, X_test=X_test, y_test=y_test)
+
     def _inference(self):
+        net = self._compile_net(mode='max-autotune')
+
         self.net.eval()
         with torch.no_grad():
-            z_lst = []
-            score_lst = []
+            z_out, s_out = None, None
+            n_filled = 0
 
             if self.verbose >= 2:
                 _iter_ = tqdm(self.test_loader, desc='testing: ')
@@ -470,15 +591,97 @@ class BaseDeepAD(metaclass=ABCMeta):
                 _iter_ = self.test_loader
 
             for batch_x in _iter_:
-                batch_z, s = self.inference_forward(batch_x, self.net, self.criterion)
-                z_lst.append(batch_z)
-                score_lst.append(s)
-
-        z = torch.cat(z_lst).data.cpu().numpy()
-        scores = torch.cat(score_lst).data.cpu().numpy()
+                batch_x = self._batch_to_device(batch_x)
+                with self._autocast():
+                    batch_z, s = self.inference_forward(batch_x, net, self.criterion)
+
+                # host outputs are allocated once for the whole test set, each batch is
+                # copied back right away so that only one batch stays on the device
+                if z_out is None:
+                    dataset = getattr(self.test_loader, 'dataset', None)
+                    n_total = len(dataset) if dataset is not None else len(self.test_loader) * batch_z.shape[0]
+                    z_out = self._empty_host(n_total, batch_z)
+                    s_out = self._empty_host(n_total, s)
+
+                size = batch_z.shape[0]
+                z_out[n_filled: n_filled+size].copy_(batch_z, non_blocking=self.non_blocking)
+                s_out[n_filled: n_filled+size].copy_(s, non_blocking=self.non_blocking)
+                n_filled += size
+
+        # wait for the copies queued on self.device, which is not always the current device
+        if self.non_blocking:
+            torch.cuda.synchronize(self.device)
+
+        z = z_out[:n_filled].numpy()
+        scores = s_out[:n_filled].numpy()
 
         return z, scores
 
+    def _empty_host(self, n, t):
+        """allocate a host tensor holding n samples shaped like the batch tensor t"""
+        # outputs of mixed precision are stored in float32 (numpy has no bfloat16)
+        dtype = torch.float32 if t.dtype in (torch.float16, torch.bfloat16) else t.dtype
+        return torch.empty((n,) + tuple(t.shape[1:]), dtype=dtype, pin_memory=self.pin_memory)
+
+    @contextmanager
+    def _cuda_backend_flags(self):
+        """autotuned cuDNN kernels and TF32 matmul/conv on cuda devices during training,
+        unless ``deterministic`` is set here or in ``torch.backends.cudnn``,
+        the process-wide flags are restored afterwards"""
+        if not str(self.device).startswith('cuda'):
+            yield
+            return
+
+        cudnn, matmul = torch.backends.cudnn, torch.backends.cuda.matmul
+        flags = (cudnn.benchmark, cudnn.deterministic, cudnn.allow_tf32, matmul.allow_tf32)
+        if self.deterministic:
+            cudnn.benchmark, cudnn.deterministic = False, True
+            cudnn.allow_tf32, matmul.allow_tf32 = False, False
+        elif not cudnn.deterministic:
+            cudnn.benchmark = True
+            cudnn.allow_tf32, matmul.allow_tf32 = True, True
+        try:
+            yield
+        finally:
+            cudnn.benchmark, cudnn.deterministic, cudnn.allow_tf32, matmul.allow_tf32 = flags
+
+    def _compile_net(self, mode):
+        """compiled view of self.net if ``use_compile`` is set, self.net itself keeps the eager module"""
+        if not self.use_compile:
+            return self.net
+        if not hasattr(torch, 'compile'):
+            warnings.warn('torch.compile requires torch>=2.0, use the eager network instead')
+            return self.net
+
+        # each mode is compiled once per network, the wrappers are dropped when
+        # self.net is replaced (e.g., by ``training_prepare`` of the next ensemble member)
+        if self._compiled_net is not self.net:
+            self._compiled, self._compiled_net = {}, self.net
+        if mode not in self._compiled:
+            self._compiled[mode] = torch.compile(self.net, mode=mode, dynamic=False)
+        return self._compiled[mode]
+
+    def _amp_enabled(self):
+        return self.use_amp and str(self.device).startswith('cuda')
+
+    def _autocast(self):
+        """mixed precision context for the forward steps, a no-op if ``use_amp`` is off"""
+        if not self._amp_enabled():
+            return nullcontext()
+        return torch.autocast(device_type=torch.device(self.device).type,
+                              dtype=getattr(torch, self.amp_dtype))
+
+    def _batch_to_device(self, batch_x):
+        """move pinned tensors of a batch (a tensor or a nested list/tuple of tensors)
+        to the device asynchronously, pageable tensors are left to the forward steps"""
+        if torch.is_tensor(batch_x):
+            if self.pin_memory and batch_x.is_pinned():
+                return batch_x.to(self.device, non_blocking=self.non_blocking)
+            return batch_x
+        if isinstance(batch_x, (list, tuple)):
+            return type(batch_x)(self._batch_to_device(b) for b in batch_x)
+        return batch_x
+
     @abstractmethod
     def training_forward(self, batch_x, net, criterion):
         """define forward step in training"""
@@ -491,12 +694,25 @@ class BaseDeepAD(metaclass=ABCMeta):
 
     @abstractmethod
     def training_prepare(self, X, y):
-        """define train_loader, net, and criterion"""
+        """define train_loader, net, and criterion
+
+        pinned batches, i.e., train_loader is built with
+        ``DataLoader(..., pin_memory=self.pin_memory)`` (and ``collate_fn=collate_float32``
+        over numpy arrays), are copied to ``self.device`` asynchronously before
+        ``training_forward``, other batches are passed as they are.
+        train_loader is expected to forward ``num_workers=self.num_workers``,
+        ``persistent_workers=self.persistent_workers`` and ``worker_init_fn=self.seed_worker``,
+        the default ``prefetch_factor`` (2) is kept as larger values hold more pinned memory
+        """
         pass
 
     @abstractmethod
     def inference_prepare(self, X):
-        """define test_loader"""
+        """define test_loader
+
+        batches of test_loader are handled in the same way as in
+        ``training_prepare`` before ``inference_forward``
+        """
         pass
 
     def epoch_update(self):
@@ -521,9 +737,21 @@ class BaseDeepAD(metaclass=ABCMeta):
     @staticmethod
     def set_seed(seed):
         torch.manual_seed(seed)
-        torch.cuda.manual_seed(seed)
-        torch.cuda.manual_seed_all(seed)
+        if torch.cuda.is_available():
+            torch.cuda.manual_seed(seed)
+            torch.cuda.manual_seed_all(seed)
         np.random.seed(seed)
         random.seed(seed)
-        # torch.backends.cudnn.benchmark = False
-        # torch.backends.cudnn.deterministic = True
+
+    @property
+    def persistent_workers(self):
+        """loader workers are kept alive across epochs, only possible with worker processes"""
+        return self.num_workers > 0
+
+    @staticmethod
+    def seed_worker(worker_id):
+        """``worker_init_fn`` of data loaders, seeds numpy and random of each
+        worker from its torch seed instead of the state forked from the parent"""
+        worker_seed = torch.initial_seed() % 2**32
+        np.random.seed(worker_seed)
+        random.seed(worker_seed)
@@ -6,6 +6,7 @@ PyTorch's implementation
 """
 
 from deepod.core.base_model import BaseDeepAD
+from deepod.utils.utility import collate_float32
 from deepod.core.networks.base_networks import MLPnet
 from torch.utils.data import DataLoader, TensorDataset
 from torch.utils.data.sampler import WeightedRandomSampler
@@ -95,7 +96,10 @@ class DevNet(BaseDeepAD):
         dataset = TensorDataset(torch.from_numpy(X).float(), torch.from_numpy(y).long())
         sampler = WeightedRandomSampler(weights=[weight_map[label.item()] for data, label in dataset],
                                         num_samples=len(dataset), replacement=True)
-        train_loader = DataLoader(dataset, batch_size=self.batch_size, sampler=sampler)
+        train_loader = DataLoader(dataset, batch_size=self.batch_size, sampler=sampler,
+                                  pin_memory=self.pin_memory,
+                                  num_workers=self.num_workers, persistent_workers=self.persistent_workers,
+                                  worker_init_fn=self.seed_worker)
 
         network_params = {
             'n_features': self.n_features,
@@ -115,7 +119,8 @@ class DevNet(BaseDeepAD):
 
     def inference_prepare(self, X):
         test_loader = DataLoader(X, batch_size=self.batch_size,
-                                 drop_last=False, shuffle=False)
+                                 drop_last=False, shuffle=False,
+                                 collate_fn=collate_float32, pin_memory=self.pin_memory)
         self.criterion.reduction = 'none'
         return test_loader
 
@@ -6,6 +6,7 @@ this is partially adapted from https://github.com/lukasruff/Deep-SAD-PyTorch (MI
 """
 
 from deepod.core.base_model import BaseDeepAD
+from deepod.utils.utility import collate_float32
 from deepod.core.networks.base_networks import MLPnet
 from torch.utils.data import DataLoader, TensorDataset
 from torch.utils.data.sampler import WeightedRandomSampler
@@ -126,7 +127,10 @@ class DeepSAD(BaseDeepAD):
                                         num_samples=len(dataset), replacement=True)
         train_loader = DataLoader(dataset, batch_size=self.batch_size,
                                   sampler=sampler,
-                                  shuffle=True if sampler is None else False)
+                                  shuffle=True if sampler is None else False,
+                                  pin_memory=self.pin_memory,
+                                  num_workers=self.num_workers, persistent_workers=self.persistent_workers,
+                                  worker_init_fn=self.seed_worker)
 
         network_params = {
             'n_features': self.n_features,
@@ -147,7 +151,8 @@ class DeepSAD(BaseDeepAD):
 
     def inference_prepare(self, X):
         test_loader = DataLoader(X, batch_size=self.batch_size,
-                                 drop_last=False, shuffle=False)
+                                 drop_last=False, shuffle=False,
+                                 collate_fn=collate_float32, pin_memory=self.pin_memory)
         self.criterion.reduction = 'none'
         return test_loader
 
@@ -5,6 +5,7 @@ One-class classification
 """
 
 from deepod.core.base_model import BaseDeepAD
+from deepod.utils.utility import collate_float32
 from deepod.core.networks.base_networks import MLPnet
 from deepod.metrics import tabular_metrics
 from torch.utils.data import DataLoader
@@ -84,7 +85,10 @@ class DeepSVDD(BaseDeepAD):
         return
 
     def training_prepare(self, X, y):
-        train_loader = DataLoader(X, batch_size=self.batch_size, shuffle=True)
+        train_loader = DataLoader(X, batch_size=self.batch_size, shuffle=True,
+                                  collate_fn=collate_float32, pin_memory=self.pin_memory,
+                                  num_workers=self.num_workers, persistent_workers=self.persistent_workers,
+                                  worker_init_fn=self.seed_worker)
 
         network_params = {
             'n_features': self.n_features,
@@ -105,7 +109,8 @@ class DeepSVDD(BaseDeepAD):
 
     def inference_prepare(self, X):
         test_loader = DataLoader(X, batch_size=self.batch_size,
-                                 drop_last=False, shuffle=False)
+                                 drop_last=False, shuffle=False,
+                                 collate_fn=collate_float32, pin_memory=self.pin_memory)
         assert self.c is not None
         self.criterion = DSVDDLoss(c=self.c, reduction='none')
         return test_loader
@@ -56,7 +56,10 @@ class GOAD(BaseDeepAD):
             print(f'{self.n_trans} transformation done')
 
         dataset = TensorDataset(x_trans, labels)
-        train_loader = DataLoader(dataset, batch_size=self.batch_size, shuffle=True)
+        train_loader = DataLoader(dataset, batch_size=self.batch_size, shuffle=True,
+                                  pin_memory=self.pin_memory,
+                                  num_workers=self.num_workers, persistent_workers=self.persistent_workers,
+                                  worker_init_fn=self.seed_worker)
 
         net = GoadNet(
             self.trans_dim,
@@ -82,7 +85,8 @@ class GOAD(BaseDeepAD):
         test_loader = DataLoader(x_trans,
                                  batch_size=self.batch_size,
                                  drop_last=False,
-                                 shuffle=False)
+                                 shuffle=False,
+                                 pin_memory=self.pin_memory)
 
         # # prepare means:
         self.net.eval()
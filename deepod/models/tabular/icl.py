@@ -7,6 +7,7 @@ https://openreview.net/forum?id=_hszZbt46bT
 """
 
 from deepod.core.base_model import BaseDeepAD
+from deepod.utils.utility import collate_float32
 from deepod.core.networks.base_networks import MLPnet
 from torch.utils.data import DataLoader
 import torch
@@ -99,7 +100,10 @@ class ICL(BaseDeepAD):
 
     def training_prepare(self, X, y):
         train_loader = DataLoader(X, batch_size=self.batch_size,
-                                  shuffle=True, pin_memory=True)
+                                  shuffle=True, collate_fn=collate_float32,
+                                  pin_memory=self.pin_memory,
+                                  num_workers=self.num_workers, persistent_workers=self.persistent_workers,
+                                  worker_init_fn=self.seed_worker)
 
         if self.kernel_size == 'auto':
             if self.n_features <= 40:
@@ -161,7 +165,8 @@ class ICL(BaseDeepAD):
 
     def inference_prepare(self, X):
         test_loader = DataLoader(X, batch_size=self.batch_size,
-                                 drop_last=False, shuffle=False)
+                                 drop_last=False, shuffle=False,
+                                 collate_fn=collate_float32, pin_memory=self.pin_memory)
         self.criterion.reduction = 'none'
         return test_loader
 
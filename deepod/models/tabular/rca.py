@@ -5,6 +5,7 @@ this script is partially adapted from https://hub.nuaa.cf/illidanlab/RCA
 """
 
 from deepod.core.base_model import BaseDeepAD
+from deepod.utils.utility import collate_float32
 from deepod.core.networks.base_networks import MLPnet
 from tqdm import trange
 from torch.utils.data import DataLoader
@@ -93,7 +94,10 @@ class RCA(BaseDeepAD):
         return
 
     def training_prepare(self, X, y):
-        train_loader = DataLoader(X, batch_size=self.batch_size, shuffle=True)
+        train_loader = DataLoader(X, batch_size=self.batch_size, shuffle=True,
+                                  collate_fn=collate_float32, pin_memory=self.pin_memory,
+                                  num_workers=self.num_workers, persistent_workers=self.persistent_workers,
+                                  worker_init_fn=self.seed_worker)
 
         net = RCANet(
             self.n_features,
@@ -112,7 +116,8 @@ class RCA(BaseDeepAD):
         return train_loader, net, criterion
 
     def inference_prepare(self, X):
-        test_loader = DataLoader(X, batch_size=self.batch_size, drop_last=False, shuffle=False)
+        test_loader = DataLoader(X, batch_size=self.batch_size, drop_last=False, shuffle=False,
+                                 collate_fn=collate_float32, pin_memory=self.pin_memory)
         self.criterion.reduction = 'none'
         return test_loader
 
@@ -171,6 +176,7 @@ class RCA(BaseDeepAD):
                 z_lst = []
                 score_lst = []
                 for batch_x in self.test_loader:
+                    batch_x = self._batch_to_device(batch_x)
                     batch_z, s = self.inference_forward(batch_x, self.net, self.criterion)
                     z_lst.append(batch_z)
                     score_lst.append(s)
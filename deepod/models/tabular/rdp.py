@@ -6,6 +6,7 @@ this script is partially adapted from https://github.com/billhhh/RDP
 """
 
 from deepod.core.base_model import BaseDeepAD
+from deepod.utils.utility import collate_float32
 from deepod.core.networks.base_networks import MLPnet
 from torch.utils.data import DataLoader
 import torch.nn.functional as F
@@ -75,7 +76,10 @@ class RDP(BaseDeepAD):
         return
 
     def training_prepare(self, X, y):
-        train_loader = DataLoader(X, batch_size=self.batch_size, shuffle=True)
+        train_loader = DataLoader(X, batch_size=self.batch_size, shuffle=True,
+                                  collate_fn=collate_float32, pin_memory=self.pin_memory,
+                                  num_workers=self.num_workers, persistent_workers=self.persistent_workers,
+                                  worker_init_fn=self.seed_worker)
 
         net = MLPnet(
             n_features=self.n_features,
@@ -93,7 +97,8 @@ class RDP(BaseDeepAD):
         return train_loader, net, criterion
 
     def inference_prepare(self, X):
-        test_loader = DataLoader(X, batch_size=self.batch_size, drop_last=False, shuffle=False)
+        test_loader = DataLoader(X, batch_size=self.batch_size, drop_last=False, shuffle=False,
+                                 collate_fn=collate_float32, pin_memory=self.pin_memory)
         self.criterion.reduction = 'none'
         return test_loader
 
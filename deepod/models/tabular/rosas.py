@@ -3,6 +3,7 @@ import numpy as np
 from torch.utils.data import DataLoader
 from torch.nn import functional as F
 from deepod.core.base_model import BaseDeepAD
+from deepod.utils.utility import collate_float32
 from deepod.core.networks.base_networks import MLPnet
 
 
@@ -124,7 +125,8 @@ class RoSAS(BaseDeepAD):
         return loss
 
     def inference_prepare(self, X):
-        test_loader = DataLoader(X, batch_size=self.batch_size, drop_last=False, shuffle=False)
+        test_loader = DataLoader(X, batch_size=self.batch_size, drop_last=False, shuffle=False,
+                                 collate_fn=collate_float32, pin_memory=self.pin_memory)
         return test_loader
 
     def inference_forward(self, batch_x, net, criterion):
@@ -14,7 +14,7 @@ from ray.air import session, Checkpoint
 from ray.tune.schedulers import ASHAScheduler
 from functools import partial
 
-from deepod.utils.utility import get_sub_seqs, get_sub_seqs_label
+from deepod.utils.utility import get_sub_seqs, get_sub_seqs_label, collate_float32
 from deepod.core.networks.ts_network_tcn import TcnResidualBlock
 from deepod.core.base_model import BaseDeepAD
 from deepod.metrics import ts_metrics, point_adjustment
@@ -296,10 +296,14 @@ class COUTA(BaseDeepAD):
         train_data = self.train_data[:int(0.8 * len(self.train_data))]
         val_data = self.train_data[int(0.8 * len(self.train_data)):]
 
+        # train_data can be read-only sub-sequence views (see ``fit_auto_hyper``),
+        # which are copied batch by batch in collate_float32
         train_loader = DataLoader(dataset=SubseqData(train_data), batch_size=self.batch_size,
-                                  drop_last=True, pin_memory=True, shuffle=True)
+                                  drop_last=True, pin_memory=True, shuffle=True,
+                                  collate_fn=collate_float32)
         val_loader = DataLoader(dataset=SubseqData(val_data), batch_size=self.batch_size,
-                                drop_last=True, pin_memory=True, shuffle=True)
+                                drop_last=True, pin_memory=True, shuffle=True,
+                                collate_fn=collate_float32)
 
         self.net = self.set_tuned_net(config)
         self.c = self._set_c(self.net, train_data)
@@ -433,7 +437,8 @@ class COUTA(BaseDeepAD):
     def _set_c(self, net, seqs, eps=0.1):
         """Initializing the center for the hypersphere"""
         dataloader = DataLoader(dataset=SubseqData(seqs), batch_size=self.batch_size,
-                                drop_last=True, pin_memory=True, shuffle=True)
+                                drop_last=True, pin_memory=True, shuffle=True,
+                                collate_fn=collate_float32)
         z_ = []
         net.eval()
         with torch.no_grad():
@@ -6,9 +6,10 @@ PyTorch's implementation
 """
 
 from deepod.core.base_model import BaseDeepAD
+from deepod.utils.utility import collate_float32, ArrayDataset
 from deepod.core.networks.base_networks import get_network
 from deepod.models.tabular.devnet import DevLoss
-from torch.utils.data import DataLoader, TensorDataset
+from torch.utils.data import DataLoader
 from torch.utils.data.sampler import WeightedRandomSampler
 import torch
 import numpy as np
@@ -117,10 +118,13 @@ class DevNetTS(BaseDeepAD):
         n_norm = self.n_samples - n_anom
         weight_map = {0: 1. / n_norm, 1: 1. / n_anom}
 
-        dataset = TensorDataset(torch.from_numpy(X).float(), torch.from_numpy(y).long())
+        dataset = ArrayDataset(X, y.astype(np.int64))
         sampler = WeightedRandomSampler(weights=[weight_map[label.item()] for data, label in dataset],
                                         num_samples=len(dataset), replacement=True)
-        train_loader = DataLoader(dataset, batch_size=self.batch_size, sampler=sampler)
+        train_loader = DataLoader(dataset, batch_size=self.batch_size, sampler=sampler,
+                                  collate_fn=collate_float32, pin_memory=self.pin_memory,
+                                  num_workers=self.num_workers, persistent_workers=self.persistent_workers,
+                                  worker_init_fn=self.seed_worker)
 
         network_params = {
             'n_features': self.n_features,
@@ -151,7 +155,8 @@ class DevNetTS(BaseDeepAD):
 
     def inference_prepare(self, X):
         test_loader = DataLoader(X, batch_size=self.batch_size,
-                                 drop_last=False, shuffle=False)
+                                 drop_last=False, shuffle=False,
+                                 collate_fn=collate_float32, pin_memory=self.pin_memory)
         self.criterion.reduction = 'none'
         return test_loader
 
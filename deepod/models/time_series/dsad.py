@@ -6,9 +6,10 @@ this is partially adapted from https://github.com/lukasruff/Deep-SAD-PyTorch (MI
 """
 
 from deepod.core.base_model import BaseDeepAD
+from deepod.utils.utility import collate_float32, ArrayDataset
 from deepod.core.networks.base_networks import get_network
 from deepod.models.tabular.dsad import DSADLoss
-from torch.utils.data import DataLoader, TensorDataset
+from torch.utils.data import DataLoader
 from torch.utils.data.sampler import WeightedRandomSampler
 import torch
 import numpy as np
@@ -127,15 +128,17 @@ class DeepSADTS(BaseDeepAD):
         if self.verbose >= 2:
             print(f'training data counter: {counter}')
 
-        dataset = TensorDataset(torch.from_numpy(X).float(),
-                                torch.from_numpy(y).long())
+        dataset = ArrayDataset(X, y.astype(np.int64))
 
         weight_map = {0: 1. / counter[0], -1: 1. / counter[-1]}
         sampler = WeightedRandomSampler(weights=[weight_map[label.item()] for data, label in dataset],
                                         num_samples=len(dataset), replacement=True)
         train_loader = DataLoader(dataset, batch_size=self.batch_size,
                                   sampler=sampler,
-                                  shuffle=True if sampler is None else False)
+                                  shuffle=True if sampler is None else False,
+                                  collate_fn=collate_float32, pin_memory=self.pin_memory,
+                                  num_workers=self.num_workers, persistent_workers=self.persistent_workers,
+                                  worker_init_fn=self.seed_worker)
 
         network_params = {
             'n_features': self.n_features,
@@ -167,7 +170,8 @@ class DeepSADTS(BaseDeepAD):
 
     def inference_prepare(self, X):
         test_loader = DataLoader(X, batch_size=self.batch_size,
-                                 drop_last=False, shuffle=False)
+                                 drop_last=False, shuffle=False,
+                                 collate_fn=collate_float32, pin_memory=self.pin_memory)
         self.criterion.reduction = 'none'
         return test_loader
 
@@ -77,16 +77,15 @@ class PReNetTS(BaseDeepAD):
         else:
             a = 30
 
-        X = torch.from_numpy(X)
-        train_data = torch.from_numpy(self.train_data)
-
+        # X and self.train_data can be read-only sub-sequence views, index them
+        # as numpy arrays so that only the sampled windows and batches are copied
         x2_a_lst = []
         x2_u_lst = []
         for i in range(a):
             a_idx = np.random.choice(known_anom_id, X.shape[0], replace=True)
             u_idx = np.random.choice(unlabeled_id, X.shape[0], replace=True)
-            x2_a = train_data[a_idx]
-            x2_u = train_data[u_idx]
+            x2_a = torch.from_numpy(self.train_data[a_idx])
+            x2_u = torch.from_numpy(self.train_data[u_idx])
 
             x2_a_lst.append(x2_a)
             x2_u_lst.append(x2_u)
@@ -97,7 +96,7 @@ class PReNetTS(BaseDeepAD):
         for i in range(n_batches):
             left = i * self.batch_size
             right = min((i + 1) * self.batch_size, len(X))
-            batch_x1 = X[left: right]
+            batch_x1 = torch.from_numpy(np.ascontiguousarray(X[left: right]))
             batch_x_sup1 = [x2[left: right] for x2 in x2_a_lst]
             batch_x_sup2 = [x2[left: right] for x2 in x2_u_lst]
             test_loader.append([batch_x1, batch_x_sup1, batch_x_sup2])
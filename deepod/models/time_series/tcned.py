@@ -4,6 +4,7 @@ TCN is adapted from https://github.com/locuslab/TCN
 import numpy as np
 
 from deepod.core.base_model import BaseDeepAD
+from deepod.utils.utility import collate_float32
 from deepod.core.networks.ts_network_tcn import TcnAE
 from deepod.metrics import ts_metrics, point_adjustment
 
@@ -36,7 +37,10 @@ class TcnED(BaseDeepAD):
         return
 
     def training_prepare(self, X, y=None):
-        train_loader = DataLoader(X, batch_size=self.batch_size, shuffle=True)
+        train_loader = DataLoader(X, batch_size=self.batch_size, shuffle=True,
+                                  collate_fn=collate_float32, pin_memory=self.pin_memory,
+                                  num_workers=self.num_workers, persistent_workers=self.persistent_workers,
+                                  worker_init_fn=self.seed_worker)
 
         net = TcnAE(
             n_features=self.n_features,
@@ -57,7 +61,8 @@ class TcnED(BaseDeepAD):
 
     def inference_prepare(self, X):
         test_loader = DataLoader(X, batch_size=self.batch_size,
-                                 drop_last=False, shuffle=False)
+                                 drop_last=False, shuffle=False,
+                                 collate_fn=collate_float32, pin_memory=self.pin_memory)
         self.criterion = torch.nn.MSELoss(reduction="none")
         return test_loader
 
@@ -78,8 +83,10 @@ class TcnED(BaseDeepAD):
         train_data = self.train_data[:int(0.8 * len(self.train_data))]
         val_data = self.train_data[int(0.8 * len(self.train_data)):]
 
-        train_loader = DataLoader(train_data, batch_size=self.batch_size, shuffle=True)
-        val_loader = DataLoader(val_data, batch_size=self.batch_size, shuffle=True)
+        train_loader = DataLoader(train_data, batch_size=self.batch_size, shuffle=True,
+                                  collate_fn=collate_float32)
+        val_loader = DataLoader(val_data, batch_size=self.batch_size, shuffle=True,
+                                collate_fn=collate_float32)
 
         criterion = torch.nn.MSELoss(reduction="mean")
         self.net = self.set_tuned_net(config)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+
+import os
+import sys
+import unittest
+
+import numpy as np
+# noinspection PyProtectedMember
+from numpy.testing import assert_equal, assert_allclose
+from scipy.stats import binom
+
+# temporary solution for relative imports in case pyod is not installed
+# if deepod is installed, no need to use the following line
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from deepod.models.tabular.dsvdd import DeepSVDD
+from deepod.utils.data import generate_data
+
+
+def predict_confidence_ref(decision_scores, test_scores, threshold, contamination):
+    # implementation with np.vectorize and binom that _predict_confidence replaced
+    n = len(decision_scores)
+
+    count_instances = np.vectorize(lambda x: np.count_nonzero(decision_scores <= x))
+    n_instances = count_instances(test_scores)
+
+    posterior_prob = np.vectorize(lambda x: (1 + x) / (2 + n))(n_instances)
+
+    confidence = np.vectorize(
+        lambda p: binom.sf(n - int(n * contamination), n, p)
+    )(posterior_prob)
+    prediction = (test_scores > threshold).astype('int').ravel()
+    np.place(confidence, prediction == 0, 1 - confidence[prediction == 0])
+    return confidence
+
+
+class TestBaseDeepAD(unittest.TestCase):
+    def setUp(self):
+        self.n_train = 200
+        self.n_test = 100
+        self.X_train, self.X_test, self.y_train, self.y_test = generate_data(
+            n_train=self.n_train, n_test=self.n_test, n_features=10,
+            contamination=0.1, random_state=42
+        )
+
+        # int(n_train * contamination) == 0 for the second detector
+        self.contaminations = [0.1, 0.001]
+        self.clfs = []
+        for contamination in self.contaminations:
+            clf = DeepSVDD(epochs=2, device='cpu', verbose=0, random_state=42)
+            clf.contamination = contamination
+            clf.fit(self.X_train)
+            self.clfs.append(clf)
+
+    def test_threshold(self):
+        for clf, contamination in zip(self.clfs, self.contaminations):
+            threshold = np.percentile(clf.decision_scores_, 100 * (1 - contamination))
+            assert_allclose(clf.threshold_, threshold)
+
+    def test_prediction_confidence(self):
+        for clf, contamination in zip(self.clfs, self.contaminations):
+            # training data are included to cover test scores tied with training scores
+            for X in [self.X_test, self.X_train]:
+                pred_labels, confidence = clf.predict(X, return_confidence=True)
+                test_scores = clf.decision_function(X)
+                confidence_ref = predict_confidence_ref(clf.decision_scores_, test_scores,
+                                                        clf.threshold_, contamination)
+
+                assert_equal(pred_labels, (test_scores > clf.threshold_).astype('int'))
+                assert_allclose(confidence, confidence_ref, rtol=1e-7, atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
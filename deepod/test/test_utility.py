@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from __future__ import print_function
+
+import os
+import sys
+import unittest
+
+import numpy as np
+# noinspection PyProtectedMember
+from numpy.testing import assert_equal
+
+# temporary solution for relative imports in case pyod is not installed
+# if deepod is installed, no need to use the following line
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from deepod.utils.utility import get_sub_seqs, get_sub_seqs_label
+
+
+def get_sub_seqs_ref(x_arr, seq_len=100, stride=1):
+    # list-comprehension implementation the vectorized helpers replaced
+    seq_starts = np.arange(0, x_arr.shape[0] - seq_len + 1, stride)
+    x_seqs = np.array([x_arr[i:i + seq_len] for i in seq_starts])
+    return x_seqs
+
+
+def get_sub_seqs_label_ref(y, seq_len=100, stride=1):
+    seq_starts = np.arange(0, y.shape[0] - seq_len + 1, stride)
+    ys = np.array([y[i:i + seq_len] for i in seq_starts])
+    y = np.sum(ys, axis=1) / seq_len
+
+    y_binary = np.zeros_like(y)
+    y_binary[np.where(y != 0)[0]] = 1
+    return y_binary
+
+
+class TestUtility(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(42)
+        self.x = rng.randn(250, 3)
+        self.y = np.zeros(250)
+        self.y[[10, 11, 97, 180, 249]] = 1
+        self.settings = [(1, 1), (10, 1), (10, 3), (30, 7), (250, 1), (250, 4)]
+
+    def test_sub_seqs(self):
+        for seq_len, stride in self.settings:
+            x_seqs_ref = get_sub_seqs_ref(self.x, seq_len, stride)
+            for contiguous in [True, False]:
+                x_seqs = get_sub_seqs(self.x, seq_len, stride, contiguous=contiguous)
+                assert_equal(x_seqs.dtype, x_seqs_ref.dtype)
+                assert_equal(x_seqs, x_seqs_ref)
+
+    def test_sub_seqs_1d(self):
+        x = self.x[:, 0]
+        for seq_len, stride in self.settings:
+            assert_equal(get_sub_seqs(x, seq_len, stride),
+                         get_sub_seqs_ref(x, seq_len, stride))
+
+    def test_sub_seqs_short(self):
+        x_seqs = get_sub_seqs(self.x[:5], seq_len=10)
+        x_seqs_ref = get_sub_seqs_ref(self.x[:5], seq_len=10)
+        assert_equal(x_seqs.shape, x_seqs_ref.shape)
+
+    def test_sub_seqs_label(self):
+        for seq_len, stride in self.settings:
+            y_seqs = get_sub_seqs_label(self.y, seq_len, stride)
+            y_seqs_ref = get_sub_seqs_label_ref(self.y, seq_len, stride)
+            assert_equal(y_seqs.shape, y_seqs_ref.shape)
+            assert_equal(y_seqs, y_seqs_ref)
+
+    def test_sub_seqs_label_2d(self):
+        y = self.y.reshape(-1, 1)
+        for seq_len, stride in self.settings:
+            y_seqs = get_sub_seqs_label(y, seq_len, stride)
+            y_seqs_ref = get_sub_seqs_label_ref(y, seq_len, stride)
+            assert_equal(y_seqs.shape, y_seqs_ref.shape)
+            assert_equal(y_seqs, y_seqs_ref)
+
+    def test_sub_seqs_label_short(self):
+        y_seqs = get_sub_seqs_label(self.y[5:15], seq_len=20)
+        assert_equal(y_seqs.shape, (0,))
+        assert_equal(len(y_seqs), len(get_sub_seqs(self.x[5:15], seq_len=20)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,11 @@
 import numpy as np
+import torch
+from torch.utils.data import Dataset
+from torch.utils.data.dataloader import default_collate
 from sklearn import metrics
 
 
-def get_sub_seqs(x_arr, seq_len=100, stride=1):
+def get_sub_seqs(x_arr, seq_len=100, stride=1, contiguous=True):
     """
 
     Parameters
@@ -16,25 +19,84 @@ def get_sub_seqs(x_arr, seq_len=100, stride=1):
     stride: int, optional (default=1)
         number of time points the window will move between two subsequences
 
+    contiguous: bool, optional (default=True)
+        If False, return a read-only zero-copy view of x_arr instead of
+        materializing the (overlapping) sub-sequences
+
     Returns
     -------
     x_seqs: np.array
         Split sub-sequences of input time-series data
     """
 
-    seq_starts = np.arange(0, x_arr.shape[0] - seq_len + 1, stride)
-    x_seqs = np.array([x_arr[i:i + seq_len] for i in seq_starts])
+    # no complete sub-sequence in a series shorter than seq_len
+    if x_arr.shape[0] < seq_len:
+        return np.array([])
+
+    x_seqs = np.lib.stride_tricks.sliding_window_view(x_arr, seq_len, axis=0)[::stride]
+    x_seqs = np.moveaxis(x_seqs, -1, 1)
+    if contiguous:
+        x_seqs = np.ascontiguousarray(x_seqs)
 
     return x_seqs
 
 
+def collate_float32(batch):
+    """
+    collate_fn of data loaders built over numpy arrays, floating-point samples are
+    stacked into a float32 tensor. Only the current batch is copied, so that samples
+    can be read-only views (e.g., sub-sequences of ``get_sub_seqs(contiguous=False)``)
+
+    Parameters
+    ----------
+    batch: list, required
+        samples of a mini-batch, numpy arrays or tuples of them
+
+    Returns
+    -------
+    batch: torch.Tensor or list
+        collated mini-batch
+    """
+    elem = batch[0]
+    if isinstance(elem, np.ndarray):
+        batch = np.stack(batch)
+        if np.issubdtype(batch.dtype, np.floating):
+            batch = batch.astype(np.float32, copy=False)
+        return torch.from_numpy(batch)
+    if isinstance(elem, (tuple, list)):
+        return [collate_float32(list(samples)) for samples in zip(*batch)]
+    return default_collate(batch)
+
+
+class ArrayDataset(Dataset):
+    """
+    Dataset of aligned numpy arrays, the i-th sample is the tuple of the i-th
+    items of all arrays. Samples are not copied, which is left to ``collate_float32``
+    of the data loader, so the arrays can be read-only views
+
+    Parameters
+    ----------
+    *arrays: np.array, required
+        arrays with the same length of the first dimension
+    """
+    def __init__(self, *arrays):
+        assert all(len(a) == len(arrays[0]) for a in arrays)
+        self.arrays = arrays
+
+    def __getitem__(self, index):
+        return tuple(a[index] for a in self.arrays)
+
+    def __len__(self):
+        return len(self.arrays[0])
+
+
 def get_sub_seqs_label(y, seq_len=100, stride=1):
     """
 
     Parameters
     ----------
     y: np.array, required
-        data labels
+        data labels with shape [time_length, ] or [time_length, 1]
 
     seq_len: int, optional (default=100)
         Size of window used to create subsequences from the data
@@ -48,12 +110,19 @@ def get_sub_seqs_label(y, seq_len=100, stride=1):
         Split label of each sequence
     """
 
-    seq_starts = np.arange(0, y.shape[0] - seq_len + 1, stride)
-    ys = np.array([y[i:i + seq_len] for i in seq_starts])
-    y = np.sum(ys, axis=1) / seq_len
+    # labels of shape [time_length, 1] keep the trailing axis
+    trailing_shape = y.shape[1:]
+    y = np.ravel(y)
+
+    # np.convolve swaps its operands if y is shorter than the window
+    if y.shape[0] < seq_len:
+        return np.zeros((0,) + trailing_shape)
+
+    # a sub-sequence is labeled as anomalous if it contains any anomalous time point
+    y_sum = np.convolve(y, np.ones(seq_len), mode='valid')[::stride]
 
-    y_binary = np.zeros_like(y)
-    y_binary[np.where(y!=0)[0]] = 1
-    return y_binary
+    y_binary = np.zeros_like(y_sum)
+    y_binary[y_sum != 0] = 1
+    return y_binary.reshape((-1,) + trailing_shape)
 
 